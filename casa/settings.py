@@ -1,3 +1,4 @@
+import logging
 from pathlib import Path
 import environ
 
@@ -53,7 +54,15 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'casa.wsgi.application'
 
+# Serve through ASGI so the async views actually run concurrently on one
+# worker (under sync WSGI workers an async view still ties up a whole
+# worker per request). Run as:
+#   gunicorn casa.asgi:application -k uvicorn.workers.UvicornWorker
+ASGI_APPLICATION = 'casa.asgi.application'
+
 # You are running only one DB, on the server, not locally
+# Persistent connections (CONN_MAX_AGE) avoid a new Postgres connection per
+# request; health checks make sure a recycled connection is still alive.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -62,6 +71,8 @@ DATABASES = {
         'PASSWORD': env("CASA_DB_PASS"),
         'HOST': '127.0.0.1',
         'PORT': '5432',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     },
     'ai_lab': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -70,6 +81,8 @@ DATABASES = {
         'PASSWORD': env("AI_LAB_DB_PASS"),
         'HOST': '127.0.0.1',
         'PORT': '5432',
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     },
 }
 
@@ -152,6 +165,15 @@ LOGGING = {
             'maxBytes': 50 * 1024 * 1024,  # 50MB
             'backupCount': 5,
         },
+        # Buffers records in memory and writes them to 'file' in batches, so
+        # request threads don't block on disk I/O per log line. Errors (and a
+        # full buffer) flush immediately; anything left flushes at shutdown.
+        'buffered_file': {
+            'class': 'logging.handlers.MemoryHandler',
+            'capacity': 200,
+            'flushLevel': logging.ERROR,
+            'target': 'file',
+        },
         'away_mode_file': {
             'level': 'INFO',
             'class': 'logging.handlers.RotatingFileHandler',
@@ -164,17 +186,17 @@ LOGGING = {
 
     'loggers': {
         'django': {
-            'handlers': ['file'],
+            'handlers': ['buffered_file'],
             'level': 'INFO',
             'propagate': True,
         },
         'core.views': {
-            'handlers': ['file'],
-            'level': 'DEBUG',
+            'handlers': ['buffered_file'],
+            'level': 'INFO',
             'propagate': False,
         },
         'ai_lab_chatbot.views': {
-            'handlers': ['file'],
+            'handlers': ['buffered_file'],
             'level': 'INFO',
             'propagate': False,
         },
@@ -183,5 +205,12 @@ LOGGING = {
             'level': 'INFO',
             'propagate': False,
         },
+        # WemoConfig.ready() swaps this handler for a QueueHandler so device
+        # fault storms never do formatting or file I/O inside request threads.
+        'wemo': {
+            'handlers': ['buffered_file'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     },
 }
@@ -0,0 +1,86 @@
+"""Minimal client for the NUT (Network UPS Tools) upsd TCP protocol.
+
+Replaces shelling out to `upsc` for every poll: one persistent socket to
+upsd is kept open and reused, so a reading costs a single request/response
+round-trip instead of fork+exec plus a fresh TCP handshake.
+"""
+
+import socket
+import threading
+
+NUT_HOST = "localhost"
+NUT_PORT = 3493
+NUT_TIMEOUT = 5  # seconds
+
+
+class NUTError(Exception):
+    """Raised when upsd can't be reached or returns an ERR response."""
+
+
+_lock = threading.Lock()
+_sock = None
+
+
+def _connect():
+    global _sock
+    _sock = socket.create_connection((NUT_HOST, NUT_PORT), timeout=NUT_TIMEOUT)
+    return _sock
+
+
+def _close():
+    global _sock
+    if _sock is not None:
+        try:
+            _sock.close()
+        except OSError:
+            pass
+        _sock = None
+
+
+def _list_var(ups):
+    """Send `LIST VAR <ups>` on the shared socket and return the raw reply."""
+    sock = _sock if _sock is not None else _connect()
+    sock.sendall(f"LIST VAR {ups}\n".encode())
+
+    buf = b""
+    while b"END LIST VAR" not in buf:
+        if buf.startswith(b"ERR") and b"\n" in buf:
+            raise NUTError(buf.decode(errors="replace").strip())
+        chunk = sock.recv(4096)
+        if not chunk:
+            raise ConnectionError("upsd closed the connection")
+        buf += chunk
+
+    return buf.decode(errors="replace")
+
+
+def get_ups_vars(ups="cyberpower"):
+    """Return all variables for *ups* as `key: value` lines (upsc format).
+
+    The output matches what `upsc <ups>@localhost` prints, so existing
+    parsers don't need to know which transport produced the reading.
+    """
+    with _lock:
+        try:
+            raw = _list_var(ups)
+        except NUTError:
+            raise
+        except Exception:
+            # Stale or broken socket (upsd restart, timeout): reconnect once
+            _close()
+            try:
+                raw = _list_var(ups)
+            except NUTError:
+                raise
+            except Exception as e:
+                _close()
+                raise NUTError(f"cannot read {ups} from upsd: {e}") from e
+
+    prefix = f"VAR {ups} "
+    lines = []
+    for line in raw.splitlines():
+        if line.startswith(prefix):
+            name, _, value = line[len(prefix):].partition(" ")
+            value = value.strip().strip('"')
+            lines.append(f"{name}: {value}")
+    return "\n".join(lines)
@@ -1,11 +1,68 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
 from django.http import HttpResponseRedirect
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import authenticate, login, logout
+import asyncio
+import re
 import subprocess, logging
+from types import MappingProxyType
+
+from core import nut
 
 logger = logging.getLogger(__name__)
 
+# One `key: value` pair per line of upsc output.
+_UPS_LINE_RE = re.compile(r'^([^:\n]+):(.*)$', re.MULTILINE)
+
+# Read-only so the dict literal is built once at import instead of per request.
+_UPS_STATUS_MAP = MappingProxyType({
+    "OL": "Online (using utility power)",
+    "OB": "On Battery (power outage)",
+    "LB": "Low Battery",
+    "HB": "High Battery",
+    "CHRG": "Charging",
+    "DISCHRG": "Discharging",
+    "RB": "Replace Battery",
+    "BYPASS": "Bypass Active",
+    "CAL": "Calibrating",
+    "OFF": "Offline",
+    "OVER": "Overload",
+    "TRIM": "Voltage Too High (Trimming)",
+    "BOOST": "Voltage Too Low (Boosting)",
+    "FSD": "Forced Shutdown",
+})
+
+UPS_CACHE_KEY = "ups_raw"
+UPS_CACHE_TTL = 5  # seconds
+
+
+def _fetch_ups_raw():
+    """Read UPS variables over the persistent upsd socket, falling back to
+    the `upsc` binary if the socket path fails."""
+    try:
+        return nut.get_ups_vars('cyberpower')
+    except nut.NUTError as e:
+        logger.warning("upsd socket read failed (%s); falling back to upsc", e)
+        return subprocess.run(
+            ['upsc', 'cyberpower@localhost'],
+            capture_output=True,
+            text=True,
+            check=True
+        ).stdout
+
+
+def _get_ups_raw(ttl=UPS_CACHE_TTL):
+    """Return raw UPS output (upsc format), cached briefly so repeated
+    dashboard loads share one reading instead of polling upsd per request."""
+    return cache.get_or_set(UPS_CACHE_KEY, _fetch_ups_raw, ttl)
+
+
+def invalidate_ups_cache():
+    """Drop the cached `upsc` output so the next dashboard load re-polls the UPS."""
+    cache.delete(UPS_CACHE_KEY)
+
 def casa_login(request):
     message = "Log in to Emo Casa"
 
@@ -33,50 +90,42 @@ def casa_logout(request):
     return HttpResponseRedirect("/")
 
 @login_required
-def dashboard_view(request):
+async def dashboard_view(request):
     ups_data = {}
     ups_error = None
     runtime_minutes = None
     current_watts = 'NA'
 
-    try:
-        result = subprocess.run(
-            ['upsc', 'cyberpower@localhost'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        logger.debug("UPSC Output:\n%s", result.stdout)
+    if request.method == "HEAD":
+        # Health checks and link prefetchers never show the UPS panel, so
+        # don't spend a UPS poll on them.
+        return await sync_to_async(render)(request, 'core/dashboard.html', {
+            'ups_data': ups_data,
+            'ups_error': ups_error,
+            'runtime_minutes': runtime_minutes,
+            'current_watts': current_watts
+        })
 
-        for line in result.stdout.splitlines():
-            if ':' in line:
-                key, value = line.split(':', 1)
-                key = key.strip().replace('.', '_')
-                ups_data[key] = value.strip()
+    try:
+        # The poll can block for seconds on a cache miss (socket timeout or
+        # the upsc fallback), so keep it off the event loop.
+        raw_output = await asyncio.to_thread(_get_ups_raw)
+        logger.debug("UPSC Output:\n%s", raw_output)
+
+        ups_data = {
+            key.strip().replace('.', '_'): value.strip()
+            for key, value in _UPS_LINE_RE.findall(raw_output)
+        }
 
         logger.debug("Parsed UPS data: %s", ups_data)
 
-        runtime_minutes = int(ups_data.get("battery_runtime", 0)) // 60
-
-        STATUS_MAP = {
-            "OL": "Online (using utility power)",
-            "OB": "On Battery (power outage)",
-            "LB": "Low Battery",
-            "HB": "High Battery",
-            "CHRG": "Charging",
-            "DISCHRG": "Discharging",
-            "RB": "Replace Battery",
-            "BYPASS": "Bypass Active",
-            "CAL": "Calibrating",
-            "OFF": "Offline",
-            "OVER": "Overload",
-            "TRIM": "Voltage Too High (Trimming)",
-            "BOOST": "Voltage Too Low (Boosting)",
-            "FSD": "Forced Shutdown",
-        }
+        # Local bind skips the repeated attribute lookups on the hot path
+        ups_get = ups_data.get
+
+        runtime_minutes = int(ups_get("battery_runtime", 0)) // 60
 
-        raw_status = ups_data.get("ups_status", "")
-        status_descriptions = [STATUS_MAP.get(code, code) for code in raw_status.split()]
+        raw_status = ups_get("ups_status", "")
+        status_descriptions = [_UPS_STATUS_MAP.get(code, code) for code in raw_status.split()]
         ups_data["ups_status_readable"] = ", ".join(status_descriptions)
 
         load_percent = int(ups_data["ups_load"])
@@ -91,7 +140,9 @@ def dashboard_view(request):
         logger.exception("Unexpected error in dashboard_view")
         ups_error = "Unexpected error occurred while fetching UPS data."
 
-    return render(request, 'core/dashboard.html', {
+    # Render via sync_to_async: the auth context processor resolves
+    # request.user through the sync ORM, which the event loop forbids
+    return await sync_to_async(render)(request, 'core/dashboard.html', {
         'ups_data': ups_data,
         'ups_error': ups_error,
         'runtime_minutes': runtime_minutes,
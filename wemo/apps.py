@@ -1,6 +1,52 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+
 from django.apps import AppConfig
 
 
 class WemoConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'wemo'
+
+    # Keeps the listener alive for the process and guards against ready()
+    # running twice (e.g. under the autoreloader).
+    _log_listener = None
+
+    def ready(self):
+        self._offload_logging()
+        self._connect_registry_signals()
+
+    @staticmethod
+    def _connect_registry_signals():
+        """Evict cached WemoSwitch instances when rows change."""
+        from django.db.models.signals import post_delete, post_save
+
+        from .models import WemoSwitch, _registry_invalidate
+        post_save.connect(_registry_invalidate, sender=WemoSwitch,
+                          dispatch_uid='wemo.registry.save')
+        post_delete.connect(_registry_invalidate, sender=WemoSwitch,
+                            dispatch_uid='wemo.registry.delete')
+
+    @classmethod
+    def _offload_logging(cls):
+        """Move the 'wemo' logger's handlers behind a queue.
+
+        Views only enqueue log records; a background QueueListener thread
+        does the formatting and file writes, so a storm of offline-device
+        warnings can't add disk latency to request handling. dictConfig
+        grows native queue support in Python 3.12; this does the same
+        wiring by hand.
+        """
+        if cls._log_listener is not None:
+            return
+        wemo_logger = logging.getLogger('wemo')
+        if not wemo_logger.handlers:
+            return
+        log_queue = queue.SimpleQueue()
+        cls._log_listener = logging.handlers.QueueListener(
+            log_queue, *wemo_logger.handlers, respect_handler_level=True)
+        wemo_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+        cls._log_listener.start()
+        atexit.register(cls._log_listener.stop)
@@ -1,7 +1,11 @@
+import asyncio
 import socket
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.utils import timezone
 
 from wemo.models import WemoSwitch
 
@@ -11,6 +15,30 @@ except ImportError:
     raise CommandError("pywemo is required. Install it with: pip install pywemo")
 
 
+# How long a single reverse lookup may take before we give up on it
+_GETHOST_TIMEOUT = 2.0
+
+
+@lru_cache(maxsize=256)
+def _gethost_cached(ip):
+    """Reverse-resolve an IP, caching results (including failures) per run.
+
+    socket.gethostbyaddr has no timeout and can hang for the resolver's
+    whole retry cycle on hosts without PTR records; asyncio's getnameinfo
+    lets the wait be capped.
+    """
+
+    async def lookup():
+        loop = asyncio.get_running_loop()
+        host, _ = await loop.getnameinfo((ip, 0), socket.NI_NAMEREQD)
+        return host
+
+    try:
+        return asyncio.run(asyncio.wait_for(lookup(), timeout=_GETHOST_TIMEOUT))
+    except Exception:
+        return None
+
+
 class Command(BaseCommand):
     help = 'Discover Wemo switches on the network and add new ones to the database'
 
@@ -28,101 +56,162 @@ class Command(BaseCommand):
 
     def safe_gethost(self, ip):
         """Safely get hostname from IP address."""
-        try:
-            return socket.gethostbyaddr(ip)[0]
-        except Exception:
-            return None
+        return _gethost_cached(ip)
+
+    def prefetch_hostnames(self, devices):
+        """Resolve reverse DNS for every discovered host concurrently.
+
+        Each gethostbyaddr can block for seconds when a PTR record is
+        missing; warming the resolver cache up front in parallel means the
+        per-device loop only does memoized lookups.
+        """
+        hosts = {getattr(device, 'host', None) for device in devices}
+        hosts.discard(None)
+        if not hosts:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(8, len(hosts))) as executor:
+            # Consume the iterator so every host is resolved and cached
+            list(executor.map(_gethost_cached, hosts))
+
+    _MISSING = object()
 
     def get_attr_any(self, obj, *names, default=None):
         """Return first attribute that exists on obj from names."""
         for name in names:
-            if hasattr(obj, name):
-                return getattr(obj, name)
+            value = getattr(obj, name, self._MISSING)
+            if value is not self._MISSING:
+                return value
         return default
 
-    def device_exists(self, device):
+    def device_snapshot(self, device):
+        """Read every attribute discovery cares about exactly once.
+
+        pywemo exposes these as properties (some lazily computed), so the
+        repeated getattr/hasattr probing across device_exists, the update
+        path and the create path paid that cost several times per device.
+        One snapshot dict per device makes the rest of the run plain
+        lookups.
+        """
+        return {
+            'name': getattr(device, 'name', None),
+            'host': getattr(device, 'host', None),
+            'port': getattr(device, 'port', None),
+            'udn': getattr(device, 'udn', None),
+            'serial': self.get_attr_any(device, 'serial_number', 'serial'),
+            'mac': getattr(device, 'mac', None),
+            'model': self.get_attr_any(device, 'model', 'model_name'),
+            'model_name': getattr(device, 'model_name', None),
+            'manufacturer': getattr(device, 'manufacturer', None),
+            'firmware_version': getattr(device, 'firmware_version', None),
+        }
+
+    def load_switch_index(self):
+        """Load every switch once and index it by each matchable identifier.
+
+        One SELECT up front replaces up to four lookup queries per
+        discovered device in device_exists.
+        """
+        self.by_udn = {}
+        self.by_serial = {}
+        self.by_mac = {}
+        self.by_ip_name = {}
+        for switch in WemoSwitch.objects.all():
+            if switch.udn:
+                self.by_udn[switch.udn] = switch
+            if switch.serial_number:
+                self.by_serial[switch.serial_number] = switch
+            if switch.mac_address:
+                self.by_mac[switch.mac_address] = switch
+            self.by_ip_name[(switch.ip_address, switch.name)] = switch
+
+    def device_exists(self, snapshot):
         """Check if device already exists in database using multiple identifiers."""
-        udn = getattr(device, 'udn', None)
-        serial = self.get_attr_any(device, 'serial_number', 'serial')
-        mac = getattr(device, 'mac', None)
-        existing_switch = None
+        udn = snapshot['udn']
+        serial = snapshot['serial']
+        mac = snapshot['mac']
 
         # Priority 1: Match by UDN (most reliable)
-        if udn:
-            existing_switch = WemoSwitch.objects.filter(udn=udn).first()
-            if existing_switch:
-                return True, 'UDN', existing_switch
+        if udn and udn in self.by_udn:
+            return True, 'UDN', self.by_udn[udn]
 
         # Priority 2: Match by Serial Number
-        if serial:
-            existing_switch = WemoSwitch.objects.filter(serial_number=serial).first()
-            if existing_switch:
-                return True, 'Serial Number', existing_switch
+        if serial and serial in self.by_serial:
+            return True, 'Serial Number', self.by_serial[serial]
 
         # Priority 3: Match by MAC Address (handles IP/port changes)
-        if mac:
-            existing_switch = WemoSwitch.objects.filter(mac_address=mac).first()
-            if existing_switch:
-                return True, 'MAC Address', existing_switch
+        if mac and mac in self.by_mac:
+            return True, 'MAC Address', self.by_mac[mac]
 
         # Fallback: check by IP and name combination
-        host = getattr(device, "host", None)
-        name = getattr(device, 'name', None)
-        if host and name:
-            existing_switch = WemoSwitch.objects.filter(ip_address=host, name=name).first()
-            if existing_switch:
-                return True, 'IP + Name', existing_switch
+        host = snapshot['host']
+        name = snapshot['name']
+        if host and name and (host, name) in self.by_ip_name:
+            return True, 'IP + Name', self.by_ip_name[(host, name)]
 
         return False, None, None
 
-    def update_existing_device(self, existing_switch, device):
-        """Update existing device with new network information."""
-        host = getattr(device, "host", None)
-        port = getattr(device, "port", None)
+    def update_existing_device(self, existing_switch, snapshot):
+        """Apply new network information to an existing switch in memory.
+
+        Returns (changes, changed_fields); the caller batches the actual
+        writes into one bulk_update instead of a save() per device.
+        """
+        host = snapshot['host']
+        port = snapshot['port']
         hostname = self.safe_gethost(host) if host else None
-        mac = getattr(device, 'mac', None)
+        mac = snapshot['mac']
 
         # Track what changed
         changes = []
+        changed_fields = []
 
         if existing_switch.ip_address != host:
             changes.append(f"IP: {existing_switch.ip_address} -> {host}")
             existing_switch.ip_address = host
+            changed_fields.append('ip_address')
 
         if existing_switch.port != port:
             changes.append(f"Port: {existing_switch.port} -> {port}")
             existing_switch.port = port
+            changed_fields.append('port')
 
         if existing_switch.hostname != hostname:
             changes.append(f"Hostname: '{existing_switch.hostname}' -> '{hostname}'")
             existing_switch.hostname = hostname
+            changed_fields.append('hostname')
 
         if mac and existing_switch.mac_address != mac:
             changes.append(f"MAC: {existing_switch.mac_address} -> {mac}")
             existing_switch.mac_address = mac
+            changed_fields.append('mac_address')
 
         # Update other fields that might have changed
-        firmware = getattr(device, 'firmware_version', None)
+        firmware = snapshot['firmware_version']
         if firmware and existing_switch.firmware_version != firmware:
             changes.append(f"Firmware: {existing_switch.firmware_version} -> {firmware}")
             existing_switch.firmware_version = firmware
+            changed_fields.append('firmware_version')
 
         # Update name if it changed
-        name = getattr(device, 'name', None)
+        name = snapshot['name']
         if name and existing_switch.name != name:
             changes.append(f"Name: '{existing_switch.name}' -> '{name}'")
             existing_switch.name = name
+            changed_fields.append('name')
 
         if changes:
-            existing_switch.save()
-            return changes
-        return None
-
-    def create_wemo_switch(self, device):
-        """Create a WemoSwitch instance from discovered device."""
-        host = getattr(device, "host", None)
-        port = getattr(device, "port", None)
-        name = getattr(device, 'name', None)
+            # save() refreshed the auto_now field; do the same for bulk_update
+            existing_switch.last_seen = timezone.now()
+            changed_fields.append('last_seen')
+            return changes, changed_fields
+        return None, []
+
+    def create_wemo_switch(self, snapshot):
+        """Create a WemoSwitch instance from a discovered device snapshot."""
+        host = snapshot['host']
+        port = snapshot['port']
+        name = snapshot['name']
 
         if not host or not name:
             self.stdout.write(
@@ -139,15 +228,23 @@ class Command(BaseCommand):
             hostname=hostname,
             ip_address=host,
             port=port,
-            model=self.get_attr_any(device, 'model', 'model_name'),
-            model_name=getattr(device, 'model_name', None),
-            serial_number=self.get_attr_any(device, 'serial_number', 'serial'),
-            udn=getattr(device, 'udn', None),
-            mac_address=getattr(device, 'mac', None),
-            manufacturer=getattr(device, 'manufacturer', None),
-            firmware_version=getattr(device, 'firmware_version', None),
+            model=snapshot['model'],
+            model_name=snapshot['model_name'],
+            serial_number=snapshot['serial'],
+            udn=snapshot['udn'],
+            mac_address=snapshot['mac'],
+            manufacturer=snapshot['manufacturer'],
+            firmware_version=snapshot['firmware_version'],
         )
 
+        # bulk_create skips WemoSwitch.save(), so enforce its identifier
+        # requirement here
+        if not switch.udn and not switch.serial_number:
+            self.stdout.write(
+                self.style.WARNING(f'Skipping {name} - no UDN or serial number')
+            )
+            return None
+
         return switch
 
     def handle(self, *args, **options):
@@ -164,30 +261,40 @@ class Command(BaseCommand):
 
         self.stdout.write(f"Found {len(devices)} device(s)")
 
+        self.load_switch_index()
+        self.prefetch_hostnames(devices)
+
         new_devices = []
+        updated_switches = []
+        updated_fields = set()
+        seen_switches = []
         existing_count = 0
         updated_count = 0
 
         for device in devices:
+            snapshot = self.device_snapshot(device)
+
             if options['verbose']:
-                self.stdout.write(f"\nProcessing: {getattr(device, 'name', 'Unknown')}")
-                self.stdout.write(f"  IP: {getattr(device, 'host', 'Unknown')}")
-                self.stdout.write(f"  UDN: {getattr(device, 'udn', 'Unknown')}")
-                self.stdout.write(
-                    f"  Serial: {self.get_attr_any(device, 'serial_number', 'serial', default='Unknown')}")
+                self.stdout.write(f"\nProcessing: {snapshot['name'] or 'Unknown'}")
+                self.stdout.write(f"  IP: {snapshot['host'] or 'Unknown'}")
+                self.stdout.write(f"  UDN: {snapshot['udn'] or 'Unknown'}")
+                self.stdout.write(f"  Serial: {snapshot['serial'] or 'Unknown'}")
 
             # Check if device already exists
-            exists, match_type, existing_switch = self.device_exists(device)
+            exists, match_type, existing_switch = self.device_exists(snapshot)
             if exists:
                 # Check if we need to update network information
                 if existing_switch:
-                    changes = self.update_existing_device(existing_switch, device)
+                    changes, changed_fields = self.update_existing_device(existing_switch, snapshot)
                     if changes:
                         updated_count += 1
+                        updated_switches.append(existing_switch)
+                        updated_fields.update(changed_fields)
                         if options['verbose']:
                             self.stdout.write(f"  Status: Updated ({', '.join(changes)})")
                     else:
                         existing_count += 1
+                        seen_switches.append(existing_switch)
                         if options['verbose']:
                             self.stdout.write(f"  Status: No changes needed (matched by {match_type})")
                 else:
@@ -197,7 +304,7 @@ class Command(BaseCommand):
                 continue
 
             # Create new device
-            switch = self.create_wemo_switch(device)
+            switch = self.create_wemo_switch(snapshot)
             if switch:
                 new_devices.append(switch)
                 if options['verbose']:
@@ -209,23 +316,34 @@ class Command(BaseCommand):
         self.stdout.write(f"  Updated devices: {updated_count}")
         self.stdout.write(f"  New devices to add: {len(new_devices)}")
 
+        # Dry run bails before any write: field changes made above only
+        # touched in-memory instances, so nothing needs rolling back.
         if options['dry_run']:
             self.stdout.write(self.style.WARNING("\nDRY RUN - No changes were actually made"))
+            if updated_switches:
+                self.stdout.write("Would update these devices:")
+                for switch in updated_switches:
+                    self.stdout.write(f"  - {switch.name} ({switch.ip_address})")
             if new_devices:
                 self.stdout.write("Would add these devices:")
                 for switch in new_devices:
                     self.stdout.write(f"  - {switch.name} ({switch.ip_address})")
             return
 
+        # One UPDATE statement for all changed devices instead of one per save()
+        if updated_switches:
+            WemoSwitch.objects.bulk_update(updated_switches, sorted(updated_fields))
+
         # Save new devices
         if new_devices:
             try:
                 with transaction.atomic():
-                    for switch in new_devices:
-                        switch.save()
-                        self.stdout.write(
-                            self.style.SUCCESS(f"Added: {switch.name} ({switch.ip_address})")
-                        )
+                    WemoSwitch.objects.bulk_create(new_devices)
+
+                for switch in new_devices:
+                    self.stdout.write(
+                        self.style.SUCCESS(f"Added: {switch.name} ({switch.ip_address})")
+                    )
 
                 self.stdout.write(
                     self.style.SUCCESS(
@@ -236,8 +354,28 @@ class Command(BaseCommand):
         else:
             self.stdout.write("No new devices to add.")
 
-        # Update last_seen for existing devices (optional)
-        if existing_count > 0:
-            self.stdout.write(f"Updated last_seen timestamp for {existing_count} existing device(s)")
+        # Refresh last_seen for unchanged existing devices (changed ones were
+        # already stamped by the bulk_update). Probes block on a device
+        # round-trip each, so run them in parallel — but only probe in the
+        # executor threads (no per-switch saves and no stray thread-local DB
+        # connections); the timestamps land in one bulk_update here.
+        if seen_switches:
+            def probe(switch):
+                try:
+                    return switch.get_state()
+                except Exception:
+                    return None
+
+            with ThreadPoolExecutor(max_workers=min(8, len(seen_switches))) as executor:
+                states = list(executor.map(probe, seen_switches))
+            now = timezone.now()
+            responsive = [switch for switch, state in zip(seen_switches, states)
+                          if state is not None]
+            for switch in responsive:
+                switch.last_seen = now
+            if responsive:
+                WemoSwitch.objects.bulk_update(responsive, ['last_seen'])
+            self.stdout.write(
+                f"Pinged {len(seen_switches)} existing device(s); {len(responsive)} responded")
 
         self.stdout.write(self.style.SUCCESS("Discovery complete!"))
\ No newline at end of file
@@ -1,5 +1,7 @@
 import random
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, time
+from functools import lru_cache
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from wemo.models import WemoSwitch, AwayModeSettings, SwitchAwaySchedule
@@ -10,6 +12,20 @@ from zoneinfo import ZoneInfo
 import logging
 logger = logging.getLogger('away_mode')
 
+# Location for North Carolina (using Raleigh as reference)
+RALEIGH = LocationInfo("Raleigh", "USA", "America/New_York", 35.7796, -78.6382)
+EASTERN = ZoneInfo("America/New_York")
+
+
+@lru_cache(maxsize=8)
+def _sunset_for(date):
+    """Sunset time for Raleigh on *date*.
+
+    astral recomputes the solar tables on every sun() call; the result
+    only changes with the date, so cache it per day.
+    """
+    return sun(RALEIGH.observer, date=date, tzinfo=EASTERN)['sunset']
+
 
 class Command(BaseCommand):
     help = 'Run Away Mode logic to control lights based on sunset and scheduled times'
@@ -30,17 +46,13 @@ class Command(BaseCommand):
 
         logger.info("Away Mode is ENABLED")
 
-        # Set up location for North Carolina (using Raleigh as reference)
-        city = LocationInfo("Raleigh", "USA", "America/New_York", 35.7796, -78.6382)
-
         # Get today's date in Eastern timezone
-        eastern = ZoneInfo("America/New_York")
+        eastern = EASTERN
         now = timezone.now().astimezone(eastern)
         today = now.date()
 
         # Get sunset time for today
-        s = sun(city.observer, date=today, tzinfo=eastern)
-        sunset_time = s['sunset']
+        sunset_time = _sunset_for(today)
 
         logger.info(f"Today's sunset: {sunset_time.strftime('%I:%M %p %Z')}")
         logger.info(f"Current time: {now.strftime('%I:%M %p %Z')}")
@@ -99,26 +111,7 @@ class Command(BaseCommand):
             planned_on_time__lte=now,
         ).select_related('switch')
 
-        for schedule in due_schedules:
-            switch = schedule.switch
-            if switch.disabled:
-                continue
-
-            logger.info(self.style.WARNING(
-                f"TIME TO TURN ON: {switch.name} "
-                f"(scheduled {schedule.planned_on_time.strftime('%I:%M %p')})"
-            ))
-
-            if dry_run:
-                logger.info(self.style.WARNING(f"  DRY RUN - Would turn on {switch.name}"))
-            else:
-                try:
-                    switch.turn_on(notes="Away Mode")
-                    schedule.on_executed = True
-                    schedule.save(update_fields=['on_executed'])
-                    logger.info(self.style.SUCCESS(f"  Turned ON: {switch.name}"))
-                except Exception as e:
-                    logger.info(self.style.ERROR(f"  Failed to turn on {switch.name}: {e}"))
+        self.execute_due(due_schedules, 'on', dry_run)
 
     def execute_scheduled_off(self, today, now, dry_run):
         """Turn off switches whose planned_off_time has passed."""
@@ -128,23 +121,57 @@ class Command(BaseCommand):
             planned_off_time__lte=now,
         ).select_related('switch')
 
+        self.execute_due(due_schedules, 'off', dry_run)
+
+    def execute_due(self, due_schedules, action, dry_run):
+        """Toggle all due switches, fanning the SOAP calls out in parallel.
+
+        Each toggle blocks on a device round-trip (5s timeout when a
+        device is offline), so several due switches were handled serially
+        before. The device calls run in a thread pool; the schedule flag
+        updates stay on the main thread's DB connection.
+        """
+        actionable = []
         for schedule in due_schedules:
             switch = schedule.switch
             if switch.disabled:
                 continue
 
+            planned = (schedule.planned_on_time if action == 'on'
+                       else schedule.planned_off_time)
             logger.info(self.style.WARNING(
-                f"TIME TO TURN OFF: {switch.name} "
-                f"(scheduled {schedule.planned_off_time.strftime('%I:%M %p')})"
+                f"TIME TO TURN {action.upper()}: {switch.name} "
+                f"(scheduled {planned.strftime('%I:%M %p')})"
             ))
 
             if dry_run:
-                logger.info(self.style.WARNING(f"  DRY RUN - Would turn off {switch.name}"))
+                logger.info(self.style.WARNING(
+                    f"  DRY RUN - Would turn {action} {switch.name}"))
+            else:
+                actionable.append(schedule)
+
+        if not actionable:
+            return
+
+        def toggle(schedule):
+            try:
+                if action == 'on':
+                    schedule.switch.turn_on(notes="Away Mode")
+                else:
+                    schedule.switch.turn_off(notes="Away Mode")
+                return None
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(4, len(actionable))) as executor:
+            errors = list(executor.map(toggle, actionable))
+
+        executed_field = f'{action}_executed'
+        for schedule, error in zip(actionable, errors):
+            switch = schedule.switch
+            if error is None:
+                setattr(schedule, executed_field, True)
+                schedule.save(update_fields=[executed_field])
+                logger.info(self.style.SUCCESS(f"  Turned {action.upper()}: {switch.name}"))
             else:
-                try:
-                    switch.turn_off(notes="Away Mode")
-                    schedule.off_executed = True
-                    schedule.save(update_fields=['off_executed'])
-                    logger.info(self.style.SUCCESS(f"  Turned OFF: {switch.name}"))
-                except Exception as e:
-                    logger.info(self.style.ERROR(f"  Failed to turn off {switch.name}: {e}"))
\ No newline at end of file
+                logger.info(self.style.ERROR(f"  Failed to turn {action} {switch.name}: {error}"))
\ No newline at end of file
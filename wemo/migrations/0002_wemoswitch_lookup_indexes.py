@@ -0,0 +1,20 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wemo', '0001_add_switch_away_schedule'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='wemoswitch',
+            name='mac_address',
+            field=models.CharField(blank=True, db_index=True, help_text='MAC address', max_length=17, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='wemoswitch',
+            index=models.Index(fields=['ip_address', 'name'], name='wemo_switch_ip_name_idx'),
+        ),
+    ]
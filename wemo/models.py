@@ -1,9 +1,150 @@
+import asyncio
+import re
+import time
+import httpx
 import requests
 import xml.etree.ElementTree as ET
-
+from functools import cached_property, lru_cache
+
+try:
+    from lxml import etree as LET
+    # Reused across probes; lxml parses SOAP noticeably faster than the
+    # pure-Python ElementTree and tolerates the sloppy XML some firmwares emit.
+    _LXML_PARSER = LET.XMLParser(huge_tree=False, recover=True)
+except ImportError:
+    LET = None
+    _LXML_PARSER = None
+
+from django.core.cache import cache
 from django.db import models
 from django.utils import timezone
 
+# SOAP envelope fragments, encoded once at import and assembled per request
+# with a single bytes.join (no format-string parsing on the hot path).
+_SOAP_HEAD = (
+    b'<?xml version="1.0" encoding="utf-8"?>'
+    b'<s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"'
+    b' s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/">'
+    b'<s:Body><u:'
+)
+_SOAP_XMLNS = b' xmlns:u="'
+_SOAP_OPEN_END = b'">'
+_SOAP_CLOSE = b'</u:'
+_SOAP_TAIL = b'></s:Body></s:Envelope>'
+
+# Fast path for the single field get_state needs; a full ElementTree parse of
+# the response is only the fallback for odd payloads.
+_BINARY_STATE_RE = re.compile(rb"<BinaryState>(-?\d+)</BinaryState>")
+
+# Don't rewrite last_seen more than once per this many seconds; status pages
+# and admin probes can ping the same switch several times a minute.
+_LAST_SEEN_MIN_INTERVAL = 60
+
+# Recent state probes live in the Django cache so bursts of dashboard
+# refreshes, multiple tabs and multiple workers share one device probe.
+# Toggles overwrite their entry so the cache never serves a stale flip.
+_STATE_CACHE_TTL = 3  # seconds
+
+
+def _state_cache_key(pk):
+    return f"wemo:state:{pk}"
+
+
+# In-process registry of WemoSwitch instances served by the per-switch
+# endpoints. Filled lazily on first fetch (never at startup, so migrate and
+# friends stay DB-free) and invalidated from post_save/post_delete signals,
+# which WemoConfig.ready() connects. Saves a SELECT per toggle/refresh; the
+# usual single-process deployment means admin edits invalidate correctly.
+_REGISTRY = {}
+
+
+def _registry_invalidate(sender, instance, **kwargs):
+    _REGISTRY.pop(instance.pk, None)
+
+
+def _registry_evict(*pks):
+    """Drop cached instances for rows changed without save() signals.
+
+    queryset.update() bypasses post_save, so call sites that update switch
+    rows that way (admin bulk enable/disable, discovery's dirty-column
+    UPDATE) must evict explicitly or the endpoints keep serving the stale
+    instance — including its cached _base_url — until the worker restarts.
+    """
+    for pk in pks:
+        _REGISTRY.pop(pk, None)
+
+
+# In-flight async probes keyed by network endpoint: concurrent callers
+# inside the cache-TTL burst window (several tabs, dashboard + batch poll)
+# await one shared future instead of each opening their own SOAP request.
+# Keying by (ip, port) rather than pk also collapses probes for rows that
+# point at the same physical device (e.g. a re-discovered duplicate).
+_IN_FLIGHT = {}
+
+
+def _observe_probe(fut):
+    """Mark a shared probe's exception as retrieved once it settles."""
+    if not fut.cancelled():
+        fut.exception()
+
+
+# Circuit breaker for dead devices: pk -> (consecutive failures, monotonic
+# deadline before which probes are skipped). An unplugged switch otherwise
+# costs every caller the full connect timeout; after repeated failures the
+# probe fails fast instead, with an exponentially growing cool-down.
+_BREAKER = {}
+_BREAKER_MAX_COOLDOWN = 60  # seconds
+
+
+def _breaker_open(pk):
+    entry = _BREAKER.get(pk)
+    return entry is not None and time.monotonic() < entry[1]
+
+
+def _breaker_record(pk, ok):
+    if ok:
+        _BREAKER.pop(pk, None)
+    else:
+        failures = _BREAKER.get(pk, (0, 0.0))[0] + 1
+        cooldown = min(2 ** failures, _BREAKER_MAX_COOLDOWN)
+        _BREAKER[pk] = (failures, time.monotonic() + cooldown)
+
+
+@lru_cache(maxsize=32)
+def _soap_parts(service_type, action, body=""):
+    """Headers + envelope for one SOAP action, built once per process.
+
+    The action payloads (GetBinaryState, SetBinaryState 0/1, ...) are
+    fixed strings, so every probe and toggle after the first reuses the
+    same bytes instead of re-encoding the envelope per request.
+    """
+    headers = {
+        "SOAPACTION": f'"{service_type}#{action}"',
+        "Content-Type": 'text/xml; charset="utf-8"',
+    }
+
+    action_b = action.encode()
+    envelope = b"".join((
+        _SOAP_HEAD, action_b, _SOAP_XMLNS, service_type.encode(),
+        _SOAP_OPEN_END, body.encode(), _SOAP_CLOSE, action_b, _SOAP_TAIL,
+    ))
+
+    return headers, envelope
+
+# One HTTP session per process, shared by every switch. Views load a fresh
+# model instance per request, so per-instance sessions never kept a
+# connection alive across requests; urllib3 pools by host:port, so each
+# device still gets its own persistent socket out of this pool.
+_SESSION = requests.Session()
+_SESSION.mount("http://", requests.adapters.HTTPAdapter(
+    pool_connections=16, pool_maxsize=32, max_retries=0))
+
+# Async counterpart for event-loop callers (the async views), with the same
+# keep-alive behaviour. Under ASGI there is one loop per worker, so the
+# client's pooled connections stay on the loop that created them.
+_ASYNC_CLIENT = httpx.AsyncClient(
+    timeout=5.0, limits=httpx.Limits(max_keepalive_connections=32))
+
 
 class WemoSwitch(models.Model):
     """Model to represent Wemo smart switches discovered on the network."""
@@ -17,7 +158,7 @@ class WemoSwitch(models.Model):
     serial_number = models.CharField(max_length=100, null=True, blank=True, help_text="Device serial number",
                                      unique=True)
     udn = models.CharField(max_length=255, null=True, blank=True, help_text="Unique Device Name", unique=True)
-    mac_address = models.CharField(max_length=17, null=True, blank=True, help_text="MAC address")
+    mac_address = models.CharField(max_length=17, null=True, blank=True, help_text="MAC address", db_index=True)
     manufacturer = models.CharField(max_length=100, null=True, blank=True, help_text="Device manufacturer")
     firmware_version = models.CharField(max_length=50, null=True, blank=True, help_text="Firmware version")
     date_added = models.DateTimeField(default=timezone.now, help_text="When this device was added to the database")
@@ -28,6 +169,10 @@ class WemoSwitch(models.Model):
         verbose_name = "Wemo Switch"
         verbose_name_plural = "Wemo Switches"
         ordering = ['-date_added']
+        indexes = [
+            # Discovery's IP + name fallback match
+            models.Index(fields=['ip_address', 'name'], name='wemo_switch_ip_name_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.ip_address})"
@@ -37,11 +182,36 @@ class WemoSwitch(models.Model):
             raise ValueError("Either UDN or Serial Number must be provided")
         super().save(*args, **kwargs)
 
+    def touch_last_seen(self):
+        """Refresh last_seen, skipping the UPDATE when it's already fresh.
+
+        The timestamp only needs minute-level resolution, so bursts of
+        toggles/refreshes against the same switch collapse into one write.
+        """
+        now = timezone.now()
+        if (self.last_seen is None
+                or (now - self.last_seen).total_seconds() >= _LAST_SEEN_MIN_INTERVAL):
+            self.last_seen = now
+            self.save(update_fields=["last_seen"])
+        return self.last_seen
+
+    async def atouch_last_seen(self):
+        """Async flavour of touch_last_seen for the async views.
+
+        Uses a direct queryset aupdate() — one UPDATE, no extra SELECT and
+        no save() signal dispatch on the hot path.
+        """
+        now = timezone.now()
+        if (self.last_seen is None
+                or (now - self.last_seen).total_seconds() >= _LAST_SEEN_MIN_INTERVAL):
+            self.last_seen = now
+            await WemoSwitch.objects.filter(pk=self.pk).aupdate(last_seen=now)
+        return self.last_seen
+
     def ping(self):
         try:
             state = self.get_state()
-            self.last_seen = timezone.now()
-            self.save(update_fields=["last_seen"])
+            self.touch_last_seen()
             return state
         except Exception:
             # Device is unreachable, return None to indicate offline status
@@ -50,50 +220,73 @@ class WemoSwitch(models.Model):
     # --------------------
     # Internal SOAP helper
     # --------------------
-    def _soap_request(self, service_type, control_url, action, body=""):
-        headers = {
-            "SOAPACTION": f'"{service_type}#{action}"',
-            "Content-Type": 'text/xml; charset="utf-8"',
-        }
-
-        envelope = f"""
-        <?xml version="1.0" encoding="utf-8"?>
-        <s:Envelope xmlns:s="http://schemas.xmlsoap.org/soap/envelope/"
-                    s:encodingStyle="http://schemas.xmlsoap.org/soap/encoding/">
-            <s:Body>
-                <u:{action} xmlns:u="{service_type}">
-                    {body}
-                </u:{action}>
-            </s:Body>
-        </s:Envelope>
-        """
+    @cached_property
+    def _base_url(self):
+        """Scheme/host/port prefix shared by every SOAP endpoint on this
+        device, built once per instance instead of per request."""
+        return f"http://{self.ip_address}:{self.port}"
+
+    def _soap_payload(self, service_type, control_url, action, body=""):
+        """Build the (url, headers, envelope) triple for one SOAP call."""
+        headers, envelope = _soap_parts(service_type, action, body)
+        return self._base_url + control_url, headers, envelope
 
-        url = f"http://{self.ip_address}:{self.port}{control_url}"
-        resp = requests.post(url, data=envelope.strip(), headers=headers, timeout=5)
+    def _soap_request(self, service_type, control_url, action, body=""):
+        url, headers, envelope = self._soap_payload(service_type, control_url, action, body)
+        resp = _SESSION.post(url, data=envelope, headers=headers, timeout=5)
         resp.raise_for_status()
-        return resp.text
+        # Raw bytes: the XML is ASCII-safe and both the regex fast path and
+        # ElementTree accept bytes, so skip requests' charset detection and
+        # str decode of every response.
+        return resp.content
 
     # --------------------
     # Switch controls
     # --------------------
-    def turn_on(self, notes=""):
+    def _already_in_state(self, desired):
+        """True if the device verifiably reports the desired state already.
+
+        A failed probe returns False so the toggle itself still runs (and
+        surfaces the real connection error to the caller)."""
+        try:
+            return self.get_state() == desired
+        except Exception:
+            return False
+
+    def turn_on(self, notes="", current_state=None):
+        # Skip the SetBinaryState round-trip (and the event row) when the
+        # device is already on. Callers that just probed the device can pass
+        # current_state to spare the extra GetBinaryState round-trip.
+        already_on = (current_state == 1) if current_state is not None \
+            else self._already_in_state(1)
+        if already_on:
+            return None
         result = self._soap_request(
             "urn:Belkin:service:basicevent:1",
             "/upnp/control/basicevent1",
             "SetBinaryState",
             "<BinaryState>1</BinaryState>")
+        cache.set(_state_cache_key(self.pk), 1, _STATE_CACHE_TTL)
         SwitchEvent.objects.create(
             event_type='switch_on',
             switch=self,
             notes=notes)
         return result
 
-    def turn_off(self, notes=""):
+    def turn_off(self, notes="", current_state=None):
+        # Skip the SetBinaryState round-trip (and the event row) when the
+        # device is already off. Callers that just probed the device can pass
+        # current_state to spare the extra GetBinaryState round-trip.
+        already_off = (current_state == 0) if current_state is not None \
+            else self._already_in_state(0)
+        if already_off:
+            return None
         result = self._soap_request(
             "urn:Belkin:service:basicevent:1",
             "/upnp/control/basicevent1",
             "SetBinaryState",
             "<BinaryState>0</BinaryState>")
+        cache.set(_state_cache_key(self.pk), 0, _STATE_CACHE_TTL)
         SwitchEvent.objects.create(
             event_type='switch_off',
             switch=self,
@@ -113,22 +306,156 @@ class WemoSwitch(models.Model):
         Raises:
             requests.exceptions.RequestException: If device is unreachable
         """
+        if _breaker_open(self.pk):
+            raise requests.exceptions.ConnectionError(
+                f"{self.name}: probe skipped, circuit open after repeated failures")
         try:
             xml = self._soap_request(
                 "urn:Belkin:service:basicevent:1",
                 "/upnp/control/basicevent1",
                 "GetBinaryState"
             )
-            root = ET.fromstring(xml)
-            state = root.find(".//BinaryState")
-            return int(state.text) if state is not None else None
         except (requests.exceptions.RequestException, requests.exceptions.ConnectionError,
                 requests.exceptions.Timeout, ConnectionRefusedError) as e:
-            # Re-raise connection-related errors so calling code can handle them
-            raise e
-        except Exception as e:
-            # For other errors (XML parsing, etc.), also raise
+            # Count the failure, then re-raise connection-related errors so
+            # calling code can handle them
+            _breaker_record(self.pk, False)
             raise e
+        _breaker_record(self.pk, True)
+        # XML parsing errors still raise, but don't trip the breaker — the
+        # device did answer
+        return self._parse_binary_state(xml)
+
+    @staticmethod
+    def _parse_binary_state(xml):
+        """Extract BinaryState from a SOAP response (regex fast path, XML fallback)."""
+        # The regex is a bytes pattern; coerce up front so str callers
+        # (tests mock _soap_request with str bodies) take the same paths
+        if isinstance(xml, str):
+            xml = xml.encode()
+        match = _BINARY_STATE_RE.search(xml)
+        if match:
+            return int(match.group(1))
+        if LET is not None:
+            root = LET.fromstring(xml, _LXML_PARSER)
+            text = root.findtext(".//{*}BinaryState")
+            return int(text) if text is not None else None
+        root = ET.fromstring(xml)
+        state = root.find(".//BinaryState")
+        return int(state.text) if state is not None else None
+
+    async def _aprobe_state(self, client=None):
+        if _breaker_open(self.pk):
+            raise requests.exceptions.ConnectionError(
+                f"{self.name}: probe skipped, circuit open after repeated failures")
+        url, headers, envelope = self._soap_payload(
+            "urn:Belkin:service:basicevent:1",
+            "/upnp/control/basicevent1",
+            "GetBinaryState")
+        try:
+            resp = await (client or _ASYNC_CLIENT).post(url, content=envelope, headers=headers)
+            resp.raise_for_status()
+        except Exception:
+            _breaker_record(self.pk, False)
+            raise
+        _breaker_record(self.pk, True)
+        return self._parse_binary_state(resp.content)
+
+    async def aget_state(self, client=None):
+        """Async get_state for event-loop callers.
+
+        Uses the shared module client by default so a whole gather()
+        fan-out rides one connection pool, and coalesces concurrent probes
+        of the same device endpoint onto a single in-flight request
+        (errors propagate to every waiter). Waiters await through
+        asyncio.shield so one caller's wait_for deadline detaches that
+        caller without cancelling the shared probe under everyone else.
+        """
+        key = (self.ip_address, self.port)
+        fut = _IN_FLIGHT.get(key)
+        if fut is not None:
+            return await asyncio.shield(fut)
+        fut = asyncio.ensure_future(self._aprobe_state(client))
+        # If every waiter detaches before the probe settles, still observe
+        # the outcome so the loop doesn't log an unretrieved exception
+        fut.add_done_callback(_observe_probe)
+        _IN_FLIGHT[key] = fut
+        try:
+            return await asyncio.shield(fut)
+        finally:
+            _IN_FLIGHT.pop(key, None)
+
+    async def aget_state_cached(self, client=None, ttl=_STATE_CACHE_TTL):
+        """aget_state with the same short TTL as get_state_cached."""
+        key = _state_cache_key(self.pk)
+        state = await cache.aget(key)
+        if state is not None:
+            return state
+        state = await self.aget_state(client)
+        if state is not None:
+            await cache.aset(key, state, ttl)
+        return state
+
+    async def aturn_on(self, notes="", current_state=None):
+        """Async turn_on with the same skip/event semantics."""
+        if current_state is None:
+            try:
+                current_state = await self.aget_state()
+            except Exception:
+                current_state = None
+        if current_state == 1:
+            return None
+        url, headers, envelope = self._soap_payload(
+            "urn:Belkin:service:basicevent:1",
+            "/upnp/control/basicevent1",
+            "SetBinaryState",
+            "<BinaryState>1</BinaryState>")
+        resp = await _ASYNC_CLIENT.post(url, content=envelope, headers=headers)
+        resp.raise_for_status()
+        await cache.aset(_state_cache_key(self.pk), 1, _STATE_CACHE_TTL)
+        await SwitchEvent.objects.acreate(
+            event_type='switch_on',
+            switch=self,
+            notes=notes)
+        return resp.content
+
+    async def aturn_off(self, notes="", current_state=None):
+        """Async turn_off with the same skip/event semantics."""
+        if current_state is None:
+            try:
+                current_state = await self.aget_state()
+            except Exception:
+                current_state = None
+        if current_state == 0:
+            return None
+        url, headers, envelope = self._soap_payload(
+            "urn:Belkin:service:basicevent:1",
+            "/upnp/control/basicevent1",
+            "SetBinaryState",
+            "<BinaryState>0</BinaryState>")
+        resp = await _ASYNC_CLIENT.post(url, content=envelope, headers=headers)
+        resp.raise_for_status()
+        await cache.aset(_state_cache_key(self.pk), 0, _STATE_CACHE_TTL)
+        await SwitchEvent.objects.acreate(
+            event_type='switch_off',
+            switch=self,
+            notes=notes)
+        return resp.content
+
+    def get_state_cached(self, ttl=_STATE_CACHE_TTL):
+        """get_state behind the Django cache with a short TTL.
+
+        Failures are not cached, so an unreachable device raises exactly
+        like get_state does.
+        """
+        key = _state_cache_key(self.pk)
+        state = cache.get(key)
+        if state is not None:
+            return state
+        state = self.get_state()
+        if state is not None:
+            cache.set(key, state, ttl)
+        return state
 
     # --------------------
     # Device info
@@ -1,6 +1,7 @@
 # tests.py
 import time
 import os
+import unittest
 from datetime import timedelta
 from unittest.mock import patch
 
@@ -10,30 +11,45 @@ from django.core.exceptions import ValidationError
 from .models import WemoSwitch, SwitchEvent
 import requests
 
+# Hardware tests talk to a physical switch and prompt for human
+# confirmation, so they block on input() and dominate suite runtime;
+# opt in explicitly when a device is available.
+HARDWARE = os.getenv('WEMO_HARDWARE_TESTS') == '1'
+
+
+def real_device_data():
+    """Device under test, overridable via TEST_WEMO_* environment variables."""
+    return {
+        'name': os.getenv('TEST_WEMO_NAME', 'Test Wemo'),
+        'ip_address': os.getenv('TEST_WEMO_IP', '192.168.1.58'),
+        'port': int(os.getenv('TEST_WEMO_PORT', '49153')),
+        'hostname': os.getenv('TEST_WEMO_HOSTNAME', 'wemo.lan'),
+        'serial_number': os.getenv('TEST_WEMO_SERIAL', 'TEST123'),
+        'udn': os.getenv('TEST_WEMO_UDN', 'uuid:Test-Device-1'),
+        'mac_address': os.getenv('TEST_WEMO_MAC', '58:EF:68:FB:C2:37'),
+        'manufacturer': os.getenv('TEST_WEMO_MANUFACTURER', 'Belkin'),
+        'model_name': os.getenv('TEST_WEMO_MODEL', 'Socket')
+    }
+
 
 class WemoSwitchModelTests(TestCase):
     """Tests for WemoSwitch model with real devices and dummy devices."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        # Load real device data from environment variables
-        self.real_device_data = {
-            'name': os.getenv('TEST_WEMO_NAME', 'Test Wemo'),
-            'ip_address': os.getenv('TEST_WEMO_IP', '192.168.1.58'),
-            'port': int(os.getenv('TEST_WEMO_PORT', '49153')),
-            'hostname': os.getenv('TEST_WEMO_HOSTNAME', 'wemo.lan'),
-            'serial_number': os.getenv('TEST_WEMO_SERIAL', 'TEST123'),
-            'udn': os.getenv('TEST_WEMO_UDN', 'uuid:Test-Device-1'),
-            'mac_address': os.getenv('TEST_WEMO_MAC', '58:EF:68:FB:C2:37'),
-            'manufacturer': os.getenv('TEST_WEMO_MANUFACTURER', 'Belkin'),
-            'model_name': os.getenv('TEST_WEMO_MODEL', 'Socket')
-        }
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test fixtures once per class.
+
+        setUpTestData runs a single time and each test gets a rolled-back
+        savepoint plus a per-test deep copy of these instances, instead of
+        re-running the two INSERTs before every test method.
+        """
+        cls.real_device_data = real_device_data()
 
         # Create a real device for testing
-        self.real_switch = WemoSwitch.objects.create(**self.real_device_data)
+        cls.real_switch = WemoSwitch.objects.create(**cls.real_device_data)
 
         # Create a dummy (offline) device for testing error handling
-        self.dummy_switch = WemoSwitch.objects.create(
+        cls.dummy_switch = WemoSwitch.objects.create(
             name='Dummy Offline Switch',
             ip_address='192.168.1.254',  # Non-existent IP
             port=49999,
@@ -62,38 +78,31 @@ class WemoSwitchModelTests(TestCase):
         """Test that UDN and serial_number must be unique."""
         from django.db import IntegrityError, transaction
 
-        # Test 1: Try to create duplicate serial number (should fail)
-        with transaction.atomic():
-            try:
-                duplicate_serial = WemoSwitch(
-                    name='Duplicate Serial',
-                    ip_address='192.168.1.101',
-                    port=49153,
-                    serial_number=self.real_switch.serial_number,  # Use actual serial from existing switch
-                    udn='uuid:Different-UDN-123'
-                )
-                duplicate_serial.save()
-                self.fail("Expected IntegrityError for duplicate serial_number but none was raised")
-            except IntegrityError:
-                pass  # Expected behavior
-
-        # Test 2: Try to create duplicate UDN (should fail)
-        with transaction.atomic():
-            try:
-                duplicate_udn = WemoSwitch(
-                    name='Duplicate UDN',
-                    ip_address='192.168.1.102',
-                    port=49153,
-                    serial_number='UNIQUE-DIFFERENT-SERIAL-456',
-                    udn=self.real_switch.udn  # Use actual UDN from existing switch
-                )
-                duplicate_udn.save()
-                self.fail("Expected IntegrityError for duplicate UDN but none was raised")
-            except IntegrityError:
-                pass  # Expected behavior
+        # Duplicate serial number should fail; assertRaises with a single
+        # inner atomic() lets the savepoint roll back cleanly without the
+        # try/fail/except dance
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            WemoSwitch(
+                name='Duplicate Serial',
+                ip_address='192.168.1.101',
+                port=49153,
+                serial_number=self.real_switch.serial_number,  # Use actual serial from existing switch
+                udn='uuid:Different-UDN-123'
+            ).save()
+
+        # Duplicate UDN should fail
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            WemoSwitch(
+                name='Duplicate UDN',
+                ip_address='192.168.1.102',
+                port=49153,
+                serial_number='UNIQUE-DIFFERENT-SERIAL-456',
+                udn=self.real_switch.udn  # Use actual UDN from existing switch
+            ).save()
 
     def test_last_seen_auto_update(self):
         """Test that last_seen updates automatically."""
+        self.real_switch.refresh_from_db()
         original_time = self.real_switch.last_seen
         time.sleep(1)
 
@@ -107,6 +116,77 @@ class WemoSwitchModelTests(TestCase):
         self.assertFalse(self.real_switch.disabled)
         self.assertFalse(self.dummy_switch.disabled)
 
+    # --------------------
+    # Offline/Dummy Device Tests
+    # --------------------
+
+    def test_get_state_offline_device(self):
+        """Test that offline device raises appropriate exception."""
+        print("\n" + "=" * 60)
+        print("TEST: Offline device - get_state")
+        print("=" * 60)
+
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.dummy_switch.get_state()
+
+        print("✓ Correctly raised exception for offline device")
+
+    def test_turn_on_offline_device(self):
+        """Test that turning on offline device raises exception."""
+        print("\n" + "=" * 60)
+        print("TEST: Offline device - turn_on")
+        print("=" * 60)
+
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.dummy_switch.turn_on()
+
+        print("✓ Correctly raised exception for offline device")
+
+    def test_turn_off_offline_device(self):
+        """Test that turning off offline device raises exception."""
+        print("\n" + "=" * 60)
+        print("TEST: Offline device - turn_off")
+        print("=" * 60)
+
+        with self.assertRaises(requests.exceptions.RequestException):
+            self.dummy_switch.turn_off()
+
+        print("✓ Correctly raised exception for offline device")
+
+    def test_ping_offline_device(self):
+        """Test that ping returns None for offline device."""
+        print("\n" + "=" * 60)
+        print("TEST: Offline device - ping")
+        print("=" * 60)
+
+        result = self.dummy_switch.ping()
+
+        self.assertIsNone(result)
+        print("✓ Ping correctly returned None for offline device")
+
+    def test_multiple_offline_attempts(self):
+        """Test that multiple attempts to reach offline device fail gracefully."""
+        print("\n" + "=" * 60)
+        print("TEST: Multiple attempts on offline device")
+        print("=" * 60)
+
+        for i in range(3):
+            with self.assertRaises(requests.exceptions.RequestException):
+                self.dummy_switch.get_state()
+            print(f"  Attempt {i + 1}: ✓ Correctly raised exception")
+
+        print("✓ All attempts handled gracefully")
+
+
+@unittest.skipUnless(HARDWARE, "set WEMO_HARDWARE_TESTS=1 to run")
+class WemoSwitchHardwareTests(TestCase):
+    """Interactive tests against a physical switch (require human verification)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create the device-under-test row from TEST_WEMO_* settings."""
+        cls.real_switch = WemoSwitch.objects.create(**real_device_data())
+
     # --------------------
     # Real Device Tests (require human verification)
     # --------------------
@@ -281,67 +361,6 @@ class WemoSwitchModelTests(TestCase):
         except requests.exceptions.RequestException as e:
             self.fail(f"Failed to communicate with real device: {e}")
 
-    # --------------------
-    # Offline/Dummy Device Tests
-    # --------------------
-
-    def test_get_state_offline_device(self):
-        """Test that offline device raises appropriate exception."""
-        print("\n" + "=" * 60)
-        print("TEST: Offline device - get_state")
-        print("=" * 60)
-
-        with self.assertRaises(requests.exceptions.RequestException):
-            self.dummy_switch.get_state()
-
-        print("✓ Correctly raised exception for offline device")
-
-    def test_turn_on_offline_device(self):
-        """Test that turning on offline device raises exception."""
-        print("\n" + "=" * 60)
-        print("TEST: Offline device - turn_on")
-        print("=" * 60)
-
-        with self.assertRaises(requests.exceptions.RequestException):
-            self.dummy_switch.turn_on()
-
-        print("✓ Correctly raised exception for offline device")
-
-    def test_turn_off_offline_device(self):
-        """Test that turning off offline device raises exception."""
-        print("\n" + "=" * 60)
-        print("TEST: Offline device - turn_off")
-        print("=" * 60)
-
-        with self.assertRaises(requests.exceptions.RequestException):
-            self.dummy_switch.turn_off()
-
-        print("✓ Correctly raised exception for offline device")
-
-    def test_ping_offline_device(self):
-        """Test that ping returns None for offline device."""
-        print("\n" + "=" * 60)
-        print("TEST: Offline device - ping")
-        print("=" * 60)
-
-        result = self.dummy_switch.ping()
-
-        self.assertIsNone(result)
-        print("✓ Ping correctly returned None for offline device")
-
-    def test_multiple_offline_attempts(self):
-        """Test that multiple attempts to reach offline device fail gracefully."""
-        print("\n" + "=" * 60)
-        print("TEST: Multiple attempts on offline device")
-        print("=" * 60)
-
-        for i in range(3):
-            with self.assertRaises(requests.exceptions.RequestException):
-                self.dummy_switch.get_state()
-            print(f"  Attempt {i + 1}: ✓ Correctly raised exception")
-
-        print("✓ All attempts handled gracefully")
-
     # --------------------
     # Additional Info Methods Tests
     # --------------------
@@ -383,25 +402,37 @@ class WemoSwitchModelTests(TestCase):
 class WemoSwitchQueryTests(TestCase):
     """Tests for querying WemoSwitch models."""
 
-    def setUp(self):
-        """Create test switches."""
-        self.enabled_switch = WemoSwitch.objects.create(
-            name='Enabled Switch',
-            ip_address='192.168.1.100',
-            port=49153,
-            serial_number='ENABLED123',
-            udn='uuid:Enabled-Device',
-            disabled=False
-        )
+    @classmethod
+    def setUpTestData(cls):
+        """Create test switches in one INSERT.
 
-        self.disabled_switch = WemoSwitch.objects.create(
-            name='Disabled Switch',
-            ip_address='192.168.1.101',
-            port=49153,
-            serial_number='DISABLED123',
-            udn='uuid:Disabled-Device',
-            disabled=True
-        )
+        bulk_create skips WemoSwitch.save(), so the UDN-or-serial
+        requirement it enforces is satisfied here by construction.
+        date_added is set explicitly — one bulk_create evaluates both
+        defaults in the same call, and identical timestamps would make
+        the -date_added ordering test_ordering relies on a coin flip.
+        """
+        now = timezone.now()
+        cls.enabled_switch, cls.disabled_switch = WemoSwitch.objects.bulk_create([
+            WemoSwitch(
+                name='Enabled Switch',
+                ip_address='192.168.1.100',
+                port=49153,
+                serial_number='ENABLED123',
+                udn='uuid:Enabled-Device',
+                disabled=False,
+                date_added=now - timedelta(minutes=1)
+            ),
+            WemoSwitch(
+                name='Disabled Switch',
+                ip_address='192.168.1.101',
+                port=49153,
+                serial_number='DISABLED123',
+                udn='uuid:Disabled-Device',
+                disabled=True,
+                date_added=now
+            ),
+        ])
 
     def test_filter_enabled_switches(self):
         """Test filtering for enabled switches only."""
@@ -1,92 +1,207 @@
+import asyncio
+import hashlib
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
-from django.shortcuts import render, get_object_or_404
+from asgiref.sync import sync_to_async
+from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.views.decorators.http import require_http_methods
+from django.http import HttpResponse, StreamingHttpResponse
+from django.core.cache import cache
+from django.views.decorators.http import condition, require_http_methods
 from django.utils import timezone
-from .models import WemoSwitch, AwayModeSettings, SwitchEvent, SwitchAwaySchedule
+from core.http import OrJsonResponse
+from .models import WemoSwitch, AwayModeSettings, SwitchEvent, SwitchAwaySchedule, \
+    _LAST_SEEN_MIN_INTERVAL, _REGISTRY, _registry_evict
 import requests
 import logging
 from datetime import datetime, timedelta, time
 from astral import LocationInfo
 from astral.sun import sun
-import pywemo
 import socket
 
+# Imported once per worker at startup (the first pywemo import costs
+# hundreds of ms); guarded so environments without it can still load the
+# module and the discover endpoint can report the problem itself.
+try:
+    import pywemo
+    _PYWEMO_AVAILABLE = True
+except ImportError:
+    pywemo = None
+    _PYWEMO_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Digest of the last rendered switch states; lets repeat dashboard loads
+# within the state-cache TTL answer with a 304 instead of re-polling.
+_ETAG_CACHE_KEY = 'wemo:etag'
+
+
+def _wemo_etag(request, *args, **kwargs):
+    return cache.get(_ETAG_CACHE_KEY)
+
+
+@lru_cache(maxsize=256)
+def safe_gethost(ip):
+    """Reverse-resolve an IP, caching results (including failures) per process.
+
+    Device IPs rarely change between discovery runs, so repeat runs skip
+    the blocking resolver call entirely.
+    """
+    try:
+        return socket.gethostbyaddr(ip)[0]
+    except Exception:
+        return None
+
+
+def _prefetch_hostnames(devices):
+    """Warm the safe_gethost cache for every discovered host in parallel.
+
+    Each reverse lookup can block for seconds when a PTR record is
+    missing; resolving them concurrently up front means the per-device
+    loop only does memoized lookups.
+    """
+    hosts = {getattr(device, 'host', None) for device in devices}
+    hosts.discard(None)
+    if not hosts:
+        return
+    with ThreadPoolExecutor(max_workers=min(16, len(hosts))) as executor:
+        # Consume the iterator so every host is resolved and cached
+        list(executor.map(safe_gethost, hosts))
+
+
+async def _afetch_switch(switch_id):
+    """Load just the columns the toggle/refresh endpoints touch.
+
+    Served from the in-process registry on repeat requests (zero queries);
+    signal handlers evict entries when a switch is edited or deleted.
+    Raises WemoSwitch.DoesNotExist for unknown or disabled switches.
+    """
+    switch = _REGISTRY.get(switch_id)
+    if switch is not None:
+        return switch
+    switch = await WemoSwitch.objects.only(
+        'id', 'name', 'ip_address', 'port', 'disabled', 'last_seen'
+    ).aget(id=switch_id, disabled=False)
+    _REGISTRY[switch_id] = switch
+    return switch
+
+
+# Hard per-device budget for dashboard probes. One slow or half-dead switch
+# otherwise holds the whole gather (and the page) for the full socket timeout.
+_POLL_TIMEOUT = 2.0
+
+
+async def _apoll_switch(switch):
+    """Fetch one switch's live state, shaped for the wemo_main template."""
+    try:
+        # Attempt to get current state (served from the short TTL cache on
+        # repeat renders)
+        state = await asyncio.wait_for(
+            switch.aget_state_cached(), _POLL_TIMEOUT)
+        online = True
+        current_state = state if state is not None else 0
+    except asyncio.TimeoutError:
+        logger.warning("State probe for %s exceeded %.1fs, treating as offline",
+                       switch.name, _POLL_TIMEOUT)
+        online = False
+        current_state = 0
+    except Exception as e:
+        logger.warning("Failed to get state for %s: %s", switch.name, e)
+        online = False
+        current_state = 0
+
+    return {
+        'switch': switch,
+        'online': online,
+        'current_state': current_state,
+        'is_on': current_state == 1
+    }
+
 
 @login_required
 @require_http_methods(["POST"])
 def wemo_discover(request):
     """AJAX endpoint to discover/update Wemo devices."""
+    if not _PYWEMO_AVAILABLE:
+        return OrJsonResponse({
+            'success': False,
+            'error': 'pywemo library not available'
+        })
+
     try:
-        def safe_gethost(ip):
-            try:
-                return socket.gethostbyaddr(ip)[0]
-            except Exception:
-                return None
-
-        def get_attr_any(obj, *names, default=None):
-            for name in names:
-                if hasattr(obj, name):
-                    return getattr(obj, name)
-            return default
-
-        def device_exists_and_update(device):
-            """Check if device exists and update if needed."""
-            udn = getattr(device, 'udn', None)
-            serial = get_attr_any(device, 'serial_number', 'serial')
-            mac = getattr(device, 'mac', None)
+        # Load every switch once and index it by each matchable identifier;
+        # one SELECT up front replaces up to four lookup queries per
+        # discovered device below.
+        all_switches = WemoSwitch.objects.only(
+            'id', 'udn', 'serial_number', 'mac_address',
+            'ip_address', 'port', 'hostname', 'name')
+        by_udn = {}
+        by_serial = {}
+        by_mac = {}
+        by_ip_name = {}
+        for existing in all_switches:
+            if existing.udn:
+                by_udn[existing.udn] = existing
+            if existing.serial_number:
+                by_serial[existing.serial_number] = existing
+            if existing.mac_address:
+                by_mac[existing.mac_address] = existing
+            by_ip_name[(existing.ip_address, existing.name)] = existing
+
+        def device_exists_and_update(d):
+            """Check if a snapshotted device exists and update if needed."""
+            udn = d['udn']
+            serial = d['serial_number'] or d['serial']
+            mac = d['mac']
+            host = d['host']
+            name = d['name']
+
+            # Match by UDN, Serial, MAC, then IP + Name fallback
             existing_switch = None
-
-            # Match by UDN, Serial, or MAC
             if udn:
-                existing_switch = WemoSwitch.objects.filter(udn=udn).first()
-                match_type = 'UDN'
-            elif serial:
-                existing_switch = WemoSwitch.objects.filter(serial_number=serial).first()
-                match_type = 'Serial'
-            elif mac:
-                existing_switch = WemoSwitch.objects.filter(mac_address=mac).first()
-                match_type = 'MAC'
-            else:
-                # Fallback to IP + Name
-                host = getattr(device, "host", None)
-                name = getattr(device, 'name', None)
-                if host and name:
-                    existing_switch = WemoSwitch.objects.filter(ip_address=host, name=name).first()
-                    match_type = 'IP+Name'
+                existing_switch = by_udn.get(udn)
+            if existing_switch is None and serial:
+                existing_switch = by_serial.get(serial)
+            if existing_switch is None and mac:
+                existing_switch = by_mac.get(mac)
+            if existing_switch is None and host and name:
+                existing_switch = by_ip_name.get((host, name))
 
             if existing_switch:
                 # Update existing device
-                host = getattr(device, "host", None)
-                port = getattr(device, "port", None)
+                port = d['port']
                 hostname = safe_gethost(host) if host else None
-                mac = getattr(device, 'mac', None)
 
                 changes = []
+                dirty = {}
                 if existing_switch.ip_address != host:
                     changes.append(f"IP: {existing_switch.ip_address} → {host}")
-                    existing_switch.ip_address = host
+                    dirty['ip_address'] = host
 
                 if existing_switch.port != port:
                     changes.append(f"Port: {existing_switch.port} → {port}")
-                    existing_switch.port = port
+                    dirty['port'] = port
 
                 if existing_switch.hostname != hostname:
                     changes.append(f"Hostname: '{existing_switch.hostname}' → '{hostname}'")
-                    existing_switch.hostname = hostname
+                    dirty['hostname'] = hostname
 
                 if mac and existing_switch.mac_address != mac:
                     changes.append(f"MAC: {existing_switch.mac_address} → {mac}")
-                    existing_switch.mac_address = mac
-
-                if changes:
-                    existing_switch.save()
+                    dirty['mac_address'] = mac
+
+                if dirty:
+                    # UPDATE only the changed columns; save() would rewrite
+                    # the whole row. auto_now doesn't apply to update(), so
+                    # stamp last_seen explicitly as save() would have.
+                    WemoSwitch.objects.filter(pk=existing_switch.pk).update(
+                        last_seen=timezone.now(), **dirty)
+                    # update() skips post_save; without this the toggle and
+                    # refresh endpoints keep hitting the device's old IP
+                    _registry_evict(existing_switch.pk)
                     return 'updated', existing_switch.name, changes
                 else:
                     return 'unchanged', existing_switch.name, []
@@ -96,8 +211,11 @@ def wemo_discover(request):
         # Discover devices
         devices = pywemo.discover_devices()
 
+        # Overlap the blocking reverse-DNS lookups before the per-device loop
+        _prefetch_hostnames(devices)
+
         if not devices:
-            return JsonResponse({
+            return OrJsonResponse({
                 'success': True,
                 'message': 'No Wemo devices found on network',
                 'discovered': 0,
@@ -110,12 +228,21 @@ def wemo_discover(request):
         updated_count = 0
         unchanged_count = 0
         details = []
+        new_switches = []
+
+        # pywemo exposes several of these as lazily computed properties, so
+        # read each attribute exactly once per device instead of re-probing
+        # it in the matcher, the update path and the create path
+        snapshot_attrs = ('udn', 'serial_number', 'serial', 'mac', 'host', 'port',
+                          'name', 'model', 'model_name', 'manufacturer',
+                          'firmware_version')
 
         for device in devices:
-            name = getattr(device, 'name', 'Unknown')
-            host = getattr(device, 'host', 'Unknown')
+            d = {k: getattr(device, k, None) for k in snapshot_attrs}
+            name = d['name'] if d['name'] is not None else 'Unknown'
+            host = d['host'] if d['host'] is not None else 'Unknown'
 
-            result, device_name, changes = device_exists_and_update(device)
+            result, device_name, changes = device_exists_and_update(d)
 
             if result == 'updated':
                 updated_count += 1
@@ -132,22 +259,26 @@ def wemo_discover(request):
                     'ip': host
                 })
             else:
-                # New device - create it
+                # New device - queue it for one bulk_create after the loop
                 try:
                     switch = WemoSwitch(
                         name=name,
                         hostname=safe_gethost(host),
                         ip_address=host,
-                        port=getattr(device, "port", None),
-                        model=get_attr_any(device, 'model', 'model_name'),
-                        model_name=getattr(device, 'model_name', None),
-                        serial_number=get_attr_any(device, 'serial_number', 'serial'),
-                        udn=getattr(device, 'udn', None),
-                        mac_address=getattr(device, 'mac', None),
-                        manufacturer=getattr(device, 'manufacturer', None),
-                        firmware_version=getattr(device, 'firmware_version', None),
+                        port=d['port'],
+                        model=d['model'] or d['model_name'],
+                        model_name=d['model_name'],
+                        serial_number=d['serial_number'] or d['serial'],
+                        udn=d['udn'],
+                        mac_address=d['mac'],
+                        manufacturer=d['manufacturer'],
+                        firmware_version=d['firmware_version'],
                     )
-                    switch.save()
+                    # bulk_create skips WemoSwitch.save(), so enforce its
+                    # identifier requirement before queueing
+                    if not switch.udn and not switch.serial_number:
+                        raise ValueError("Either UDN or Serial Number must be provided")
+                    new_switches.append(switch)
                     new_count += 1
                     details.append({
                         'action': 'added',
@@ -161,7 +292,11 @@ def wemo_discover(request):
                         'error': str(e)
                     })
 
-        return JsonResponse({
+        # One INSERT for all new devices instead of a save() round-trip each
+        if new_switches:
+            WemoSwitch.objects.bulk_create(new_switches, ignore_conflicts=True)
+
+        return OrJsonResponse({
             'success': True,
             'message': f'Discovery complete: {new_count} added, {updated_count} updated, {unchanged_count} unchanged',
             'discovered': len(devices),
@@ -171,52 +306,68 @@ def wemo_discover(request):
             'details': details
         })
 
-    except ImportError:
-        return JsonResponse({
-            'success': False,
-            'error': 'pywemo library not available'
-        })
     except Exception as e:
-        logger.error(f"Error in wemo_discover: {e}")
-        return JsonResponse({
+        logger.error("Error in wemo_discover: %s", e)
+        return OrJsonResponse({
             'success': False,
             'error': f'Discovery failed: {str(e)}'
         })
 
 
 @login_required
-def wemo_main(request):
+@condition(etag_func=_wemo_etag)
+async def wemo_main(request):
     """Main Wemo control page with device status."""
-    switches = WemoSwitch.objects.filter(disabled=False).order_by('name')
-    events = SwitchEvent.objects.select_related('switch').all()[:20]
+    # only(): the template and state probes touch a handful of columns, and
+    # the materialized list means total_switches is a len(), not a COUNT(*)
+    switches = [
+        s async for s in WemoSwitch.objects.filter(disabled=False)
+        .only('id', 'name', 'hostname', 'ip_address', 'port', 'disabled', 'last_seen')
+        .order_by('name')
+    ]
+    events = [e async for e in SwitchEvent.objects.select_related('switch').all()[:20]]
 
     try:
-        away_mode_enabled = AwayModeSettings.get_settings().enabled
+        away_mode_enabled = (await sync_to_async(AwayModeSettings.get_settings)()).enabled
     except Exception as e:
-        logger.error(f"Error fetching Away Mode setting: {e}")
+        logger.error("Error fetching Away Mode setting: %s", e)
         away_mode_enabled = False
 
-    # Get current state for each switch
-    switch_data = []
-    for switch in switches:
-        try:
-            # Attempt to get current state
-            state = switch.get_state()
-            online = True
-            current_state = state if state is not None else 0
-        except Exception as e:
-            logger.warning(f"Failed to get state for {switch.name}: {e}")
-            online = False
-            current_state = 0
-
-        switch_data.append({
-            'switch': switch,
-            'online': online,
-            'current_state': current_state,
-            'is_on': current_state == 1
-        })
+    # Poll every switch concurrently on the event loop; each probe blocks on
+    # a device round-trip (5s timeout offline), so doing them one at a time
+    # made the page cost the sum of all probes. The shared module client in
+    # wemo.models gives the whole fan-out one keep-alive connection pool.
+    if switches:
+        switch_data = await asyncio.gather(
+            *(_apoll_switch(switch) for switch in switches))
+    else:
+        switch_data = []
+
+    # Stamp last_seen for every switch that answered in one UPDATE instead
+    # of a save() per row, applying the same minute-level throttle as
+    # touch_last_seen.
+    now = timezone.now()
+    seen = [
+        data['switch'] for data in switch_data
+        if data['online'] and (
+            data['switch'].last_seen is None
+            or (now - data['switch'].last_seen).total_seconds() >= _LAST_SEEN_MIN_INTERVAL)
+    ]
+    if seen:
+        for switch in seen:
+            switch.last_seen = now
+        await WemoSwitch.objects.abulk_update(seen, ['last_seen'])
+
+    # Digest of every (switch, state) pair; doubles as the fragment-cache
+    # key for the grid and the ETag for conditional GETs
+    state_etag = hashlib.md5(";".join(
+        f"{data['switch'].id}:{data['current_state']}:{int(data['online'])}"
+        for data in switch_data
+    ).encode()).hexdigest()
+    await cache.aset(_ETAG_CACHE_KEY, state_etag, 3)
 
     context = {
+        'state_etag': state_etag,
         'switch_data': switch_data,
         'total_switches': len(switches),
         'online_count': sum(1 for data in switch_data if data['online']),
@@ -224,7 +375,165 @@ def wemo_main(request):
         'events': events
     }
 
-    return render(request, 'wemo/wemo_main.html', context)
+    # render resolves request.user via the sync ORM (auth context processor),
+    # so it has to run in a thread off the event loop
+    return await sync_to_async(render)(request, 'wemo/wemo_main.html', context)
+
+
+# SSE plumbing: one background poller per process fans state deltas out to
+# every connected client queue, so N open dashboards cost one probe loop
+# instead of N polling timers.
+_SSE_SUBSCRIBERS = set()
+_SSE_POLLER = None
+_SSE_POLL_INTERVAL = 5  # seconds
+_SSE_LAST_STATES = {}
+
+
+async def _sse_poll_loop():
+    """Poll all enabled switches and push changed states to subscribers.
+
+    Runs only while at least one client is connected.
+    """
+    global _SSE_POLLER
+    try:
+        while _SSE_SUBSCRIBERS:
+            switches = [
+                s async for s in WemoSwitch.objects.filter(disabled=False)
+                .only('id', 'name', 'ip_address', 'port', 'disabled')
+            ]
+            states = await asyncio.gather(
+                *(switch.aget_state_cached() for switch in switches),
+                return_exceptions=True)
+
+            delta = {}
+            for switch, state in zip(switches, states):
+                if isinstance(state, BaseException):
+                    payload = {'online': False, 'current_state': 0, 'is_on': False}
+                else:
+                    current_state = state if state is not None else 0
+                    payload = {
+                        'online': True,
+                        'current_state': current_state,
+                        'is_on': current_state == 1,
+                    }
+                payload['name'] = switch.name
+                if _SSE_LAST_STATES.get(switch.id) != payload:
+                    _SSE_LAST_STATES[switch.id] = payload
+                    delta[switch.id] = payload
+
+            if delta:
+                for queue in list(_SSE_SUBSCRIBERS):
+                    queue.put_nowait(delta)
+
+            await asyncio.sleep(_SSE_POLL_INTERVAL)
+    finally:
+        _SSE_POLLER = None
+
+
+@login_required
+@require_http_methods(["GET"])
+async def wemo_events(request):
+    """Push switch state changes as Server-Sent Events.
+
+    Clients get the current snapshot on connect and then only deltas, so
+    idle dashboards generate no further requests at all.
+    """
+    global _SSE_POLLER
+    queue = asyncio.Queue()
+    _SSE_SUBSCRIBERS.add(queue)
+    if _SSE_POLLER is None:
+        _SSE_POLLER = asyncio.ensure_future(_sse_poll_loop())
+
+    async def stream():
+        try:
+            if _SSE_LAST_STATES:
+                yield f"data: {json.dumps(_SSE_LAST_STATES)}\n\n"
+            while True:
+                delta = await queue.get()
+                yield f"data: {json.dumps(delta)}\n\n"
+        finally:
+            _SSE_SUBSCRIBERS.discard(queue)
+
+    response = StreamingHttpResponse(stream(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    return response
+
+
+@login_required
+@require_http_methods(["GET"])
+async def wemo_status_batch(request):
+    """Return the state of many switches in one response.
+
+    Polling N switches through wemo_refresh_status costs N browser fetches
+    (capped at 6 per origin) and N full request/middleware cycles; this
+    endpoint probes all requested devices concurrently and amortizes that
+    overhead across the batch. ?ids=1,2,3 limits the poll; default is all
+    enabled switches.
+    """
+    try:
+        queryset = WemoSwitch.objects.filter(disabled=False).only(
+            'id', 'name', 'ip_address', 'port', 'disabled', 'last_seen')
+        ids_param = request.GET.get('ids')
+        if ids_param:
+            try:
+                ids = [int(part) for part in ids_param.split(',') if part.strip()]
+            except ValueError:
+                return OrJsonResponse({
+                    'success': False,
+                    'error': 'ids must be a comma-separated list of integers'
+                }, status=400)
+            queryset = queryset.filter(id__in=ids)
+
+        switches = [s async for s in queryset]
+        states = await asyncio.gather(
+            *(switch.aget_state_cached() for switch in switches),
+            return_exceptions=True)
+
+        switches_data = []
+        for switch, state in zip(switches, states):
+            if isinstance(state, BaseException):
+                switches_data.append({
+                    'id': switch.id,
+                    'name': switch.name,
+                    'online': False,
+                    'current_state': 0,
+                    'is_on': False,
+                })
+            else:
+                current_state = state if state is not None else 0
+                switches_data.append({
+                    'id': switch.id,
+                    'name': switch.name,
+                    'online': True,
+                    'current_state': current_state,
+                    'is_on': current_state == 1,
+                })
+
+        # Stamp last_seen for the responders in one UPDATE, same throttle
+        # as wemo_main — clients that migrate here from per-switch
+        # wemo_refresh_status calls must not stop refreshing the timestamp
+        now = timezone.now()
+        seen = [
+            switch for switch, state in zip(switches, states)
+            if not isinstance(state, BaseException) and (
+                switch.last_seen is None
+                or (now - switch.last_seen).total_seconds() >= _LAST_SEEN_MIN_INTERVAL)
+        ]
+        if seen:
+            for switch in seen:
+                switch.last_seen = now
+            await WemoSwitch.objects.abulk_update(seen, ['last_seen'])
+
+        return OrJsonResponse({
+            'success': True,
+            'switches': switches_data
+        })
+    except Exception as e:
+        logger.error("Error in wemo_status_batch: %s", e)
+        return OrJsonResponse({
+            'success': False,
+            'error': str(e)
+        })
 
 
 @login_required
@@ -245,76 +554,98 @@ def event_history(request):
             } if event.switch else None
         } for event in events]
 
-        return JsonResponse({
+        return OrJsonResponse({
             'success': True,
             'events': events_data
         })
     except Exception as e:
-        logger.error(f"Error fetching event history: {e}")
-        return JsonResponse({
+        logger.error("Error fetching event history: %s", e)
+        return OrJsonResponse({
             'success': False,
             'error': str(e)
         })
 
 @login_required
 @require_http_methods(["POST"])
-def wemo_toggle(request, switch_id):
+async def wemo_toggle(request, switch_id):
     """AJAX endpoint to toggle a Wemo switch."""
     try:
-        switch = get_object_or_404(WemoSwitch, id=switch_id, disabled=False)
+        try:
+            switch = await _afetch_switch(switch_id)
+        except WemoSwitch.DoesNotExist:
+            return OrJsonResponse({
+                'success': False,
+                'error': 'Switch not found'
+            }, status=404)
 
-        # Get current state first
+        # If the caller already knows the state it wants (wemo_main just
+        # rendered it), skip the GetBinaryState pre-read so a toggle costs
+        # one device round-trip instead of two; any drift gets corrected by
+        # the next status refresh.
         try:
-            current_state = switch.get_state()
-            if current_state is None:
-                return JsonResponse({
+            desired = json.loads(request.body or b"{}").get('desired_state')
+        except ValueError:
+            desired = None
+
+        if desired in (0, 1):
+            current_state = 1 - desired
+        else:
+            # Get current state first
+            try:
+                current_state = await switch.aget_state()
+                if current_state is None:
+                    return OrJsonResponse({
+                        'success': False,
+                        'error': 'Could not determine current switch state',
+                        'online': False
+                    })
+            except Exception as e:
+                logger.error("Failed to get state for switch %s: %s", switch.name, e)
+                return OrJsonResponse({
                     'success': False,
-                    'error': 'Could not determine current switch state',
+                    'error': f'Device appears to be offline: {str(e)}',
                     'online': False
                 })
-        except Exception as e:
-            logger.error(f"Failed to get state for switch {switch.name}: {e}")
-            return JsonResponse({
-                'success': False,
-                'error': f'Device appears to be offline: {str(e)}',
-                'online': False
-            })
 
         # Toggle the switch
         try:
             if current_state == 1:
-                switch.turn_off()
+                await switch.aturn_off(current_state=current_state)
                 new_state = 0
                 action = 'turned off'
             else:
-                switch.turn_on()
+                await switch.aturn_on(current_state=current_state)
                 new_state = 1
                 action = 'turned on'
 
-            # Update last_seen timestamp
-            switch.last_seen = timezone.now()
-            switch.save(update_fields=['last_seen'])
+            # Refresh last_seen (skips the UPDATE when already fresh) and
+            # retire the dashboard ETag so the next load re-renders
+            await switch.atouch_last_seen()
+            await cache.adelete(_ETAG_CACHE_KEY)
 
-            return JsonResponse({
+            # Lean payload: is_on is derivable from new_state and the
+            # toast text is only built when the caller asks for it.
+            payload = {
                 'success': True,
                 'new_state': new_state,
-                'is_on': new_state == 1,
-                'message': f'{switch.name} {action} successfully',
                 'online': True,
-                'last_seen': switch.last_seen.isoformat()
-            })
+                'last_seen': switch.last_seen
+            }
+            if request.GET.get('verbose'):
+                payload['message'] = f'{switch.name} {action} successfully'
+            return OrJsonResponse(payload)
 
         except Exception as e:
-            logger.error(f"Failed to toggle switch {switch.name}: {e}")
-            return JsonResponse({
+            logger.error("Failed to toggle switch %s: %s", switch.name, e)
+            return OrJsonResponse({
                 'success': False,
                 'error': f'Failed to control device: {str(e)}',
                 'online': False
             })
 
     except Exception as e:
-        logger.error(f"Error in wemo_toggle: {e}")
-        return JsonResponse({
+        logger.error("Error in wemo_toggle: %s", e)
+        return OrJsonResponse({
             'success': False,
             'error': 'An unexpected error occurred'
         })
@@ -322,33 +653,45 @@ def wemo_toggle(request, switch_id):
 
 @login_required
 @require_http_methods(["GET"])
-def wemo_refresh_status(request, switch_id):
+async def wemo_refresh_status(request, switch_id):
     """AJAX endpoint to refresh the status of a specific switch."""
     try:
-        switch = get_object_or_404(WemoSwitch, id=switch_id, disabled=False)
+        try:
+            switch = await _afetch_switch(switch_id)
+        except WemoSwitch.DoesNotExist:
+            return OrJsonResponse({
+                'success': False,
+                'error': 'Switch not found'
+            }, status=404)
 
         try:
-            state = switch.get_state()
-            switch.last_seen = timezone.now()
-            switch.save(update_fields=['last_seen'])
+            state = await switch.aget_state()
+            await switch.atouch_last_seen()
+
+            # Answer 304 with no body when the client already shows this
+            # state — a fast poll loop then costs headers only.
+            etag = f'"{state}"'
+            if request.headers.get('If-None-Match') == etag:
+                return HttpResponse(status=304)
 
-            return JsonResponse({
+            response = OrJsonResponse({
                 'success': True,
                 'current_state': state,
-                'is_on': state == 1,
                 'online': True,
-                'last_seen': switch.last_seen.isoformat()
+                'last_seen': switch.last_seen
             })
+            response['ETag'] = etag
+            return response
         except Exception as e:
-            logger.error(f"Failed to refresh status for {switch.name}: {e}")
-            return JsonResponse({
+            logger.error("Failed to refresh status for %s: %s", switch.name, e)
+            return OrJsonResponse({
                 'success': False,
                 'error': str(e),
                 'online': False
             })
 
     except Exception as e:
-        return JsonResponse({
+        return OrJsonResponse({
             'success': False,
             'error': 'Switch not found'
         })
@@ -398,7 +741,7 @@ def away_mode_status(request):
                 'off_executed': sched.off_executed,
             })
 
-        return JsonResponse({
+        return OrJsonResponse({
             'success': True,
             'enabled': settings.enabled,
             'sunset_time': sunset_time.strftime('%I:%M %p'),
@@ -410,8 +753,8 @@ def away_mode_status(request):
             'switch_schedules': switch_schedules,
         })
     except Exception as e:
-        logger.error(f"Error getting away mode status: {e}")
-        return JsonResponse({
+        logger.error("Error getting away mode status: %s", e)
+        return OrJsonResponse({
             'success': False,
             'error': str(e)
         })
@@ -431,14 +774,14 @@ def away_mode_toggle(request):
             notes=f"Toggled by {request.user.username}"
         )
 
-        return JsonResponse({
+        return OrJsonResponse({
             'success': True,
             'enabled': settings.enabled,
             'message': f"Away Mode {'enabled' if settings.enabled else 'disabled'}"
         })
     except Exception as e:
-        logger.error(f"Error toggling away mode: {e}")
-        return JsonResponse({
+        logger.error("Error toggling away mode: %s", e)
+        return OrJsonResponse({
             'success': False,
             'error': str(e)
         })
\ No newline at end of file